@@ -3,6 +3,7 @@ import { uploadAndOptimizeImage, checkUsageLimit } from '@/lib/cloudinary';
 import {
   validateFileSize,
   validateFileType,
+  validateFileSignature,
   checkRateLimit,
   getClientIp,
   SECURITY_CONFIG,
@@ -45,6 +46,11 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    // 使用量の取得をフォームデータの解析と並行して開始
+    const usagePromise = checkUsageLimit();
+    // 早期リターンした場合に未処理のrejectionとならないようにする
+    usagePromise.catch(() => {});
+
     const formData = await request.formData();
     const files = formData.getAll('images') as File[];
     const outputSizesStr = formData.get('outputSizes') as string;
@@ -69,14 +75,23 @@ export async function POST(request: NextRequest) {
     }
 
     // 使用量チェック
-    const usageCheck = await checkUsageLimit();
+    const usageCheck = await usagePromise;
     if (usageCheck.isNearLimit) {
       console.warn('Cloudinary無料枠が80%を超えています:', usageCheck.usage);
     }
 
     // 並列処理で画像を最適化（各画像×各サイズ）
-    const processPromises = files.flatMap((file, fileIndex) => 
-      outputSizes.map(async (outputSize: string, sizeIndex: number) => {
+    const processPromises = files.flatMap((file, fileIndex) => {
+      // 同じファイルの全サイズで読み込んだバッファを共有する
+      let bufferPromise: Promise<Buffer> | null = null;
+      const readBuffer = () => {
+        if (!bufferPromise) {
+          bufferPromise = file.arrayBuffer().then(arrayBuffer => Buffer.from(arrayBuffer));
+        }
+        return bufferPromise;
+      };
+
+      return outputSizes.map(async (outputSize: string, sizeIndex: number) => {
       // ファイルサイズ検証
       const sizeValidation = validateFileSize(file);
       if (!sizeValidation.valid) {
@@ -102,7 +117,20 @@ export async function POST(request: NextRequest) {
       }
       
       try {
-        const buffer = Buffer.from(await file.arrayBuffer());
+        const buffer = await readBuffer();
+
+        // ファイル内容検証（申告されたContent-Typeだけを信用しない）
+        const signatureValidation = validateFileSignature(buffer);
+        if (!signatureValidation.valid) {
+          return {
+            success: false,
+            error: {
+              fileName: file.name,
+              error: signatureValidation.error!,
+            },
+          };
+        }
+
         const filename = `${Date.now()}_${fileIndex}_${sizeIndex}_${file.name.replace(/[^a-zA-Z0-9.-]/g, '_')}`;
         
         // 出力サイズに応じた設定
@@ -111,7 +139,8 @@ export async function POST(request: NextRequest) {
         const result = await uploadAndOptimizeImage(buffer, filename, {
           width,
           height,
-          quality: '95',
+          // 画像ごとに最適な品質をCloudinaryが1回のエンコードで決定
+          quality: 'auto:best',
         });
         
         return {
@@ -141,7 +170,8 @@ export async function POST(request: NextRequest) {
           isQuotaError: errorMessage.includes('無料枠の使用量を超えました'),
         };
       }
-    }));
+      });
+    });
 
     // すべての処理を並列実行
     const processResults = await Promise.allSettled(processPromises);
@@ -31,20 +31,26 @@ export async function POST(request: NextRequest) {
     });
     clearTimeout(timeoutId);
     
-    if (!response.ok) {
+    if (!response.ok || !response.body) {
       throw new Error(`Failed to fetch image: ${response.status}`);
     }
     
     const contentType = response.headers.get('content-type') || 'image/jpeg';
-    const arrayBuffer = await response.arrayBuffer();
+    // fetchが展開済みのボディを返す場合は元のContent-Lengthと一致しないため引き継がない
+    const contentLength = response.headers.get('content-encoding')
+      ? null
+      : response.headers.get('content-length');
     
     // レスポンスヘッダーを設定
     const headers = new Headers(getSecurityHeaders());
     headers.set('Content-Type', contentType);
-    headers.set('Content-Length', arrayBuffer.byteLength.toString());
+    if (contentLength) {
+      headers.set('Content-Length', contentLength);
+    }
     headers.set('Cache-Control', 'public, max-age=31536000'); // 1年間キャッシュ
     
-    return new NextResponse(arrayBuffer, {
+    // 画像全体をメモリに読み込まず、取得したボディをそのままストリーミング
+    return new NextResponse(response.body, {
       status: 200,
       headers: headers
     });
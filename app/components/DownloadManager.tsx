@@ -14,34 +14,42 @@ export default function DownloadManager({ batchInfo, onReset }: Props) {
   const [downloadingIndividual, setDownloadingIndividual] = useState(false);
 
 
+  // プロキシAPIを使用して画像を取得
+  const fetchImageBlob = async (imageUrl: string): Promise<Blob> => {
+    const response = await fetch('/api/proxy/download', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ url: imageUrl }),
+    });
+    if (!response.ok) throw new Error('画像の取得に失敗しました');
+
+    return response.blob();
+  };
+
+  const saveBlob = (blob: Blob, imageUrl: string, index: number) => {
+    // Cloudinary URLから適切なファイル形式を取得
+    const urlParts = imageUrl.split('.');
+    const extension = urlParts[urlParts.length - 1].split('?')[0] || 'jpg';
+
+    const url = window.URL.createObjectURL(blob);
+    
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `Amazon最適化画像_${index + 1}.${extension}`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    
+    // メモリを解放
+    window.URL.revokeObjectURL(url);
+  };
+
   const handleIndividualDownload = async (imageUrl: string, index: number) => {
     try {
-      // Cloudinary URLから適切なファイル形式を取得
-      const urlParts = imageUrl.split('.');
-      const extension = urlParts[urlParts.length - 1].split('?')[0] || 'jpg';
-      
-      // プロキシAPIを使用して画像を取得
-      const response = await fetch('/api/proxy/download', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ url: imageUrl }),
-      });
-      if (!response.ok) throw new Error('画像の取得に失敗しました');
-      
-      const blob = await response.blob();
-      const url = window.URL.createObjectURL(blob);
-      
-      const link = document.createElement('a');
-      link.href = url;
-      link.download = `Amazon最適化画像_${index + 1}.${extension}`;
-      document.body.appendChild(link);
-      link.click();
-      document.body.removeChild(link);
-      
-      // メモリを解放
-      window.URL.revokeObjectURL(url);
+      const blob = await fetchImageBlob(imageUrl);
+      saveBlob(blob, imageUrl, index);
     } catch (error) {
       console.error('個別ダウンロードエラー:', error);
       setDownloadError(`画像 ${index + 1} のダウンロードに失敗しました`);
@@ -55,12 +63,27 @@ export default function DownloadManager({ batchInfo, onReset }: Props) {
     setDownloadError(null);
     
     try {
-      // 各画像を順次ダウンロード（短い間隔で）
-      for (let i = 0; i < batchInfo.image_urls.length; i++) {
-        await handleIndividualDownload(batchInfo.image_urls[i], i);
-        // ブラウザの負荷を軽減するため少し待機
+      // すべての画像を並列に取得
+      const blobResults = await Promise.allSettled(
+        batchInfo.image_urls.map(imageUrl => fetchImageBlob(imageUrl))
+      );
+
+      const failedIndexes: number[] = [];
+      for (let i = 0; i < blobResults.length; i++) {
+        const result = blobResults[i];
+        if (result.status === 'rejected') {
+          console.error('個別ダウンロードエラー:', result.reason);
+          failedIndexes.push(i + 1);
+          continue;
+        }
+        saveBlob(result.value, batchInfo.image_urls[i], i);
+        // ブラウザが連続ダウンロードをブロックしないよう少し待機
         await new Promise(resolve => setTimeout(resolve, 300));
       }
+
+      if (failedIndexes.length > 0) {
+        setDownloadError(`画像 ${failedIndexes.join(', ')} のダウンロードに失敗しました`);
+      }
     } catch (error) {
       console.error('一括個別ダウンロードエラー:', error);
       setDownloadError('一部の画像のダウンロードに失敗しました');
@@ -5,15 +5,54 @@ import { useDropzone } from 'react-dropzone';
 import imageCompression from 'browser-image-compression';
 import Image from 'next/image';
 
+// JPEGヘッダーのSOFマーカーから画像サイズを取得（デコードせずに判定するため）
+async function readJpegDimensions(file: File): Promise<{ width: number; height: number } | null> {
+  const bytes = new Uint8Array(await file.slice(0, 64 * 1024).arrayBuffer());
+  if (bytes[0] !== 0xff || bytes[1] !== 0xd8) return null;
+
+  let offset = 2;
+  while (offset + 9 < bytes.length) {
+    if (bytes[offset] !== 0xff) return null;
+    const marker = bytes[offset + 1];
+
+    // パディング・長さを持たないマーカーは読み飛ばす
+    if (marker === 0xff) {
+      offset += 1;
+      continue;
+    }
+    if (marker === 0x01 || (marker >= 0xd0 && marker <= 0xd7)) {
+      offset += 2;
+      continue;
+    }
+    // SOS以降に画像サイズは出現しない
+    if (marker === 0xda) return null;
+
+    // SOF0〜SOF15（DHT・JPG・DACを除く）
+    if (marker >= 0xc0 && marker <= 0xcf && marker !== 0xc4 && marker !== 0xc8 && marker !== 0xcc) {
+      return {
+        height: (bytes[offset + 5] << 8) | bytes[offset + 6],
+        width: (bytes[offset + 7] << 8) | bytes[offset + 8],
+      };
+    }
+
+    const length = (bytes[offset + 2] << 8) | bytes[offset + 3];
+    offset += 2 + length;
+  }
+  return null;
+}
+
 interface Props {
-  onUpload: (files: File[], outputSizes: string[] | string[][]) => void;
+  onUpload: (
+    files: File[],
+    outputSizes: string[] | string[][],
+    prepareFile?: (file: File) => Promise<File>
+  ) => void;
   disabled: boolean;
 }
 
 export default function ImageUploader({ onUpload, disabled }: Props) {
   const [previews, setPreviews] = useState<string[]>([]);
   const [selectedFiles, setSelectedFiles] = useState<File[]>([]);
-  const [isCompressing, setIsCompressing] = useState(false);
   const [outputSizes, setOutputSizes] = useState<string[]>(['2000x2000']);
   const [customWidth, setCustomWidth] = useState('');
   const [customHeight, setCustomHeight] = useState('');
@@ -111,13 +150,21 @@ export default function ImageUploader({ onUpload, disabled }: Props) {
   const compressImage = async (file: File): Promise<File> => {
     const options = {
       maxSizeMB: 1, // 1MB以下に圧縮
-      maxWidthOrHeight: 1920, // 最大解像度
+      maxWidthOrHeight: 2000, // 最大解像度（標準出力サイズ2000x2000で再拡大させない）
       useWebWorker: true,
       fileType: 'image/jpeg' as const,
       quality: 0.8, // 品質80%
     };
 
     try {
+      // 条件を満たすJPEGは再エンコードによる劣化を避けてそのまま送信
+      if (file.type === 'image/jpeg' && file.size <= options.maxSizeMB * 1024 * 1024) {
+        const dimensions = await readJpegDimensions(file);
+        if (dimensions && Math.max(dimensions.width, dimensions.height) <= options.maxWidthOrHeight) {
+          return file;
+        }
+      }
+
       const compressedFile = await imageCompression(file, options);
       return compressedFile;
     } catch (error) {
@@ -126,7 +173,7 @@ export default function ImageUploader({ onUpload, disabled }: Props) {
     }
   };
 
-  const handleUpload = async () => {
+  const handleUpload = () => {
     if (selectedFiles.length === 0) return;
 
     // 個別モードの場合、各画像にサイズが設定されているか確認
@@ -140,34 +187,14 @@ export default function ImageUploader({ onUpload, disabled }: Props) {
       }
     }
 
-    setIsCompressing(true);
-    try {
-      // 各画像を圧縮
-      const compressedFiles = await Promise.all(
-        selectedFiles.map(file => compressImage(file))
+    // 圧縮は各ファイルのアップロード直前に行い、圧縮とアップロードを重ねて実行する
+    if (individualMode) {
+      const individualSizesArray = selectedFiles.map((_, idx) =>
+        individualSizes[idx] || []
       );
-
-      // 個別モードの場合は各画像のサイズを配列として送信
-      if (individualMode) {
-        const individualSizesArray = selectedFiles.map((_, idx) =>
-          individualSizes[idx] || []
-        );
-        onUpload(compressedFiles, individualSizesArray);
-      } else {
-        onUpload(compressedFiles, outputSizes);
-      }
-    } catch (error) {
-      console.error('Compression error:', error);
-      if (individualMode) {
-        const individualSizesArray = selectedFiles.map((_, idx) =>
-          individualSizes[idx] || []
-        );
-        onUpload(selectedFiles, individualSizesArray);
-      } else {
-        onUpload(selectedFiles, outputSizes);
-      }
-    } finally {
-      setIsCompressing(false);
+      onUpload(selectedFiles, individualSizesArray, compressImage);
+    } else {
+      onUpload(selectedFiles, outputSizes, compressImage);
     }
   };
 
@@ -476,16 +503,13 @@ export default function ImageUploader({ onUpload, disabled }: Props) {
             disabled={
               disabled ||
               selectedFiles.length === 0 ||
-              isCompressing ||
               (!individualMode && outputSizes.length === 0)
             }
             className="btn-primary w-full text-lg py-4"
           >
-            {isCompressing
-              ? '圧縮中...'
-              : disabled
-                ? '処理中...'
-                : `処理開始 (${selectedFiles.length}枚)`
+            {disabled
+              ? '処理中...'
+              : `処理開始 (${selectedFiles.length}枚)`
             }
           </button>
         </div>
@@ -14,22 +14,25 @@ export default function Home() {
   const [processing, setProcessing] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  const handleUpload = async (files: File[], outputSizes: string[] | string[][] = ['2000x2000']) => {
+  const handleUpload = async (
+    files: File[],
+    outputSizes: string[] | string[][] = ['2000x2000'],
+    prepareFile?: (file: File) => Promise<File>
+  ) => {
     setProcessing(true);
     setError(null);
 
     try {
-      // 各ファイルを個別にアップロード（分割アップロード）
-      const results: ProcessingResult[] = [];
-      const errors: ProcessingError[] = [];
-
       // 個別サイズモードかどうかを判定
       const isIndividualMode = Array.isArray(outputSizes[0]);
 
-      for (let i = 0; i < files.length; i++) {
-        const file = files[i];
+      // 各ファイルを個別のリクエストとして並列にアップロード（分割アップロード）
+      const uploadPromises = files.map(async (file, i) => {
+        // 圧縮が終わったファイルから順次アップロードを開始
+        const uploadFile = prepareFile ? await prepareFile(file) : file;
+
         const formData = new FormData();
-        formData.append('images', file);
+        formData.append('images', uploadFile);
 
         // 個別モードの場合は各ファイルのサイズを使用、一括モードは全体のサイズを使用
         const sizesForThisFile = isIndividualMode
@@ -37,40 +40,46 @@ export default function Home() {
           : (outputSizes as string[]);
 
         formData.append('outputSizes', JSON.stringify(sizesForThisFile));
-        
-        try {
-          const response = await fetch('/api/process', {
-            method: 'POST',
-            body: formData,
-            headers: {
-              'X-Batch-Index': i.toString(),
-              'X-Batch-Total': files.length.toString(),
-            },
-          });
-          
-          const data = await response.json();
-          
-          if (!response.ok) {
-            throw new Error(data.message || data.error || `エラーが発生しました (${response.status})`);
-          }
-          
-          if (data.error) {
-            throw new Error(data.message || data.error);
-          }
-          
-          // 個別結果を保存
-          if (data.results && data.results.length > 0) {
-            results.push(...data.results);
-          }
-          
-        } catch (error) {
-          console.error(`File ${i + 1} processing error:`, error);
+
+        const response = await fetch('/api/process', {
+          method: 'POST',
+          body: formData,
+          headers: {
+            'X-Batch-Index': i.toString(),
+            'X-Batch-Total': files.length.toString(),
+          },
+        });
+
+        const data = await response.json();
+
+        if (!response.ok) {
+          throw new Error(data.message || data.error || `エラーが発生しました (${response.status})`);
+        }
+
+        if (data.error) {
+          throw new Error(data.message || data.error);
+        }
+
+        return (data.results || []) as ProcessingResult[];
+      });
+
+      const uploadResults = await Promise.allSettled(uploadPromises);
+
+      // ファイル順に結果を集計
+      const results: ProcessingResult[] = [];
+      const errors: ProcessingError[] = [];
+
+      uploadResults.forEach((result, i) => {
+        if (result.status === 'fulfilled') {
+          results.push(...result.value);
+        } else {
+          console.error(`File ${i + 1} processing error:`, result.reason);
           errors.push({
-            fileName: file.name,
-            error: error instanceof Error ? error.message : '処理中にエラーが発生しました'
+            fileName: files[i].name,
+            error: result.reason instanceof Error ? result.reason.message : '処理中にエラーが発生しました'
           });
         }
-      }
+      });
       
       // 全体的な結果を作成
       const batchId = Date.now().toString();
@@ -1,6 +1,10 @@
 import { v2 as cloudinary } from 'cloudinary';
+import { Agent } from 'https';
 import type { CloudinaryUploadOptions, CloudinaryUploadResult, CloudinaryUsageLimit } from '../types/api';
 
+// Cloudinary API呼び出しでTLS接続を再利用するための共有エージェント
+const cloudinaryAgent = new Agent({ keepAlive: true, maxSockets: 32 });
+
 // Cloudinary設定を動的に行う
 function getCloudinaryConfig() {
   // 環境変数を直接読み込む
@@ -28,11 +32,19 @@ function getCloudinaryConfig() {
   };
 }
 
+// 初期化済みフラグ（設定はプロセスごとに1回だけ行う）
+let cloudinaryInitialized = false;
+
 // 初期化関数
 function initCloudinary() {
+  if (cloudinaryInitialized) {
+    return true;
+  }
+  
   try {
     const config = getCloudinaryConfig();
     cloudinary.config(config);
+    cloudinaryInitialized = true;
     return true;
   } catch (error) {
     console.error('Failed to initialize Cloudinary:', error);
@@ -40,15 +52,47 @@ function initCloudinary() {
   }
 }
 
-// 使用量チェック
-export async function checkUsageLimit() {
+// 使用量キャッシュの有効期間（Admin APIのレート制限と往復時間を節約）
+const USAGE_CACHE_TTL_MS = 60 * 1000;
+
+type UsageCheckResult = Awaited<ReturnType<typeof fetchUsageLimit>>;
+
+let usageCache: { value: UsageCheckResult; expiresAt: number } | null = null;
+let pendingUsageRequest: Promise<UsageCheckResult> | null = null;
+
+// 使用量チェック（キャッシュ付き）
+export async function checkUsageLimit(): Promise<UsageCheckResult> {
+  if (usageCache && Date.now() < usageCache.expiresAt) {
+    return usageCache.value;
+  }
+  
+  // 同時に来た呼び出しは1回のAPI呼び出しを共有する
+  if (!pendingUsageRequest) {
+    pendingUsageRequest = fetchUsageLimit()
+      .then(result => {
+        // 取得に失敗した結果（usage: null）はキャッシュしない
+        if (result.usage) {
+          usageCache = { value: result, expiresAt: Date.now() + USAGE_CACHE_TTL_MS };
+        }
+        return result;
+      })
+      .finally(() => {
+        pendingUsageRequest = null;
+      });
+  }
+  
+  return pendingUsageRequest;
+}
+
+// 使用量をCloudinaryから取得
+async function fetchUsageLimit() {
   // Cloudinaryを初期化
   if (!initCloudinary()) {
     throw new Error('Cloudinary initialization failed');
   }
   
   try {
-    const usage = await cloudinary.api.usage();
+    const usage = await cloudinary.api.usage({ agent: cloudinaryAgent });
     
     // 無料枠の制限
     const limits = {
@@ -130,6 +174,22 @@ interface UploadResult {
   };
 }
 
+// JPEGのクロマサブサンプリング（4:2:0）
+const JPEG_CHROMA_SUBSAMPLING = '420';
+
+// アップロード再試行設定
+const UPLOAD_MAX_ATTEMPTS = 3;
+const UPLOAD_RETRY_BASE_DELAY_MS = 500;
+// 1回のアップロードのタイムアウト
+const UPLOAD_ATTEMPT_TIMEOUT_MS = 30000;
+// 再試行を含むアップロード全体の時間上限（APIルートのmaxDuration 60秒に余裕を持たせる）
+const UPLOAD_TOTAL_BUDGET_MS = 45000;
+// 残り時間がこれ未満なら再試行しない
+const UPLOAD_MIN_ATTEMPT_MS = 10000;
+
+// 再試行可能なアップロードエラー
+class RetryableUploadError extends Error {}
+
 // 画像アップロードと最適化
 export async function uploadAndOptimizeImage(
   file: Buffer,
@@ -140,6 +200,9 @@ export async function uploadAndOptimizeImage(
     quality?: string;
   } = {}
 ): Promise<UploadResult> {
+  // 再試行を含めた処理期限
+  const deadline = Date.now() + UPLOAD_TOTAL_BUDGET_MS;
+  
   // Cloudinaryを初期化
   if (!initCloudinary()) {
     throw new Error('Cloudinary initialization failed');
@@ -158,20 +221,57 @@ export async function uploadAndOptimizeImage(
     );
   }
   
+  // 一時的なエラーは期限内に収まる場合のみ指数バックオフで再試行
+  for (let attempt = 0; ; attempt++) {
+    const timeoutMs = Math.min(UPLOAD_ATTEMPT_TIMEOUT_MS, deadline - Date.now());
+    try {
+      return await uploadOnce(file, filename, options, timeoutMs);
+    } catch (error) {
+      const delay = UPLOAD_RETRY_BASE_DELAY_MS * 2 ** attempt;
+      const remainingAfterDelay = deadline - Date.now() - delay;
+      if (
+        attempt + 1 >= UPLOAD_MAX_ATTEMPTS ||
+        !(error instanceof RetryableUploadError) ||
+        remainingAfterDelay < UPLOAD_MIN_ATTEMPT_MS
+      ) {
+        throw error;
+      }
+      console.warn(`アップロード再試行 (${attempt + 1}/${UPLOAD_MAX_ATTEMPTS - 1}) ${delay}ms後:`, error);
+      await new Promise(resolve => setTimeout(resolve, delay));
+    }
+  }
+}
+
+// 1回分のアップロード処理
+function uploadOnce(
+  file: Buffer,
+  filename: string,
+  options: {
+    width?: number;
+    height?: number;
+    quality?: string;
+  },
+  timeoutMs: number
+): Promise<UploadResult> {
   return new Promise<UploadResult>((resolve, reject) => {
-    // タイムアウト設定（30秒）
+    // タイムアウト設定
     const timeout = setTimeout(() => {
-      reject(new Error('アップロードがタイムアウトしました（30秒）'));
-    }, 30000);
+      reject(new Error(`アップロードがタイムアウトしました（${Math.round(timeoutMs / 1000)}秒）`));
+    }, timeoutMs);
 
     // デフォルトサイズまたは指定されたサイズを使用
     const targetWidth = options.width || 2000;
     const targetHeight = options.height || 2000;
-    const quality = parseInt(options.quality || '95');
+    // 'auto' / 'auto:best' などはCloudinaryの自動品質選択に任せ、数値指定には4:2:0を明示
+    // （Cloudinaryは品質90以上ではクロマサブサンプリングを行わないため）
+    const quality = options.quality?.startsWith('auto')
+      ? options.quality
+      : `${parseInt(options.quality || '95')}:${JPEG_CHROMA_SUBSAMPLING}`;
     
     const uploadOptions = {
       public_id: `amazon-fba/${filename}`,
       resource_type: 'image' as const,
+      agent: cloudinaryAgent,
       transformation: [
         {
           // 指定されたサイズに最適化
@@ -189,27 +289,15 @@ export async function uploadAndOptimizeImage(
           enhance: true,
         },
       ],
-      // バリエーション作成
+      // バリエーション作成（メイン画像は上記の変換で保存済みのため、サムネイルのみ）
       eager: [
-        { 
-          width: targetWidth, 
-          height: targetHeight, 
-          crop: 'pad', 
-          gravity: 'center',
-          background: 'white',
-          quality: quality,
-          format: 'jpg',
-          flags: ['progressive'],
-          effect: 'sharpen:100',
-          enhance: true,
-        }, // メイン画像（指定サイズ）
         { 
           width: Math.min(300, targetWidth), 
           height: Math.min(300, targetHeight), 
           crop: 'pad', 
           gravity: 'center',
           background: 'white',
-          quality: 90,
+          quality: `90:${JPEG_CHROMA_SUBSAMPLING}`,
           format: 'jpg',
         },  // サムネイル（300x300以下）
       ],
@@ -221,7 +309,10 @@ export async function uploadAndOptimizeImage(
         clearTimeout(timeout); // タイムアウトをクリア
         
         if (error) {
-          reject(new Error(`画像アップロードエラー: ${error.message}`));
+          const message = `画像アップロードエラー: ${error.message}`;
+          // 5xx・レート制限・ネットワークエラーは一時的なものとして再試行対象にする
+          const transient = !error.http_code || error.http_code >= 500 || error.http_code === 420 || error.http_code === 429;
+          reject(transient ? new RetryableUploadError(message) : new Error(message));
         } else if (result) {
           resolve({
             url: result.secure_url,
@@ -231,8 +322,9 @@ export async function uploadAndOptimizeImage(
             format: result.format,
             bytes: result.bytes,
             variants: {
-              main: result.eager?.[0]?.secure_url,
-              thumbnail: result.eager?.[1]?.secure_url,
+              // 変換済みで保存された画像をそのままメイン画像として使用
+              main: result.secure_url,
+              thumbnail: result.eager?.[0]?.secure_url,
             },
           });
         } else {
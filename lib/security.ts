@@ -15,6 +15,32 @@ export const SECURITY_CONFIG = {
   ],
 };
 
+// 許可するMIMEタイプの検索用セット
+const allowedMimeTypeSet = new Set(SECURITY_CONFIG.allowedMimeTypes);
+
+// 指定位置のバイト列が一致するか確認
+function hasBytes(bytes: Uint8Array, expected: number[], offset = 0): boolean {
+  return expected.every((byte, i) => bytes[offset + i] === byte);
+}
+
+function asciiBytes(text: string): number[] {
+  return Array.from(text, char => char.charCodeAt(0));
+}
+
+// 画像形式ごとのファイル先頭シグネチャ（マジックバイト）
+const IMAGE_SIGNATURES: { mimeType: string; matches: (bytes: Uint8Array) => boolean }[] = [
+  { mimeType: 'image/jpeg', matches: bytes => hasBytes(bytes, [0xff, 0xd8, 0xff]) },
+  { mimeType: 'image/png', matches: bytes => hasBytes(bytes, [0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]) },
+  {
+    mimeType: 'image/gif',
+    matches: bytes => hasBytes(bytes, asciiBytes('GIF87a')) || hasBytes(bytes, asciiBytes('GIF89a')),
+  },
+  {
+    mimeType: 'image/webp',
+    matches: bytes => hasBytes(bytes, asciiBytes('RIFF')) && hasBytes(bytes, asciiBytes('WEBP'), 8),
+  },
+];
+
 // ファイルサイズ検証
 export function validateFileSize(file: File): { valid: boolean; error?: string } {
   if (file.size > SECURITY_CONFIG.maxFileSize) {
@@ -28,7 +54,7 @@ export function validateFileSize(file: File): { valid: boolean; error?: string }
 
 // ファイルタイプ検証
 export function validateFileType(file: File): { valid: boolean; error?: string } {
-  if (!SECURITY_CONFIG.allowedMimeTypes.includes(file.type)) {
+  if (!allowedMimeTypeSet.has(file.type)) {
     return {
       valid: false,
       error: `サポートされていないファイル形式です。対応形式: ${SECURITY_CONFIG.allowedMimeTypes.join(', ')}`,
@@ -37,6 +63,18 @@ export function validateFileType(file: File): { valid: boolean; error?: string }
   return { valid: true };
 }
 
+// ファイル内容の検証（Content-Typeは偽装できるため先頭バイトで形式を確認）
+export function validateFileSignature(bytes: Uint8Array): { valid: boolean; error?: string } {
+  const signature = IMAGE_SIGNATURES.find(({ matches }) => matches(bytes));
+  if (!signature || !allowedMimeTypeSet.has(signature.mimeType)) {
+    return {
+      valid: false,
+      error: 'ファイルの内容が画像形式ではありません。',
+    };
+  }
+  return { valid: true };
+}
+
 // レート制限チェック
 export function checkRateLimit(identifier: string): { allowed: boolean; retryAfter?: number } {
   const now = Date.now();